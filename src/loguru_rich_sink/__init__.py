@@ -1,5 +1,4 @@
-from rich.console import Console
-from rich.traceback import install as tr_install
+import atexit
 
 from loguru_rich_sink.__main__ import (
     get_console,
@@ -10,8 +9,7 @@ from loguru_rich_sink.__main__ import (
 )
 from loguru_rich_sink.sink import RichSink, increment, read, rich_sink, setup, write
 
-console = Console()
-tr_install(console=console)
+console = get_console()
 
 __all__ = [
     "RichSink",
@@ -28,3 +26,6 @@ __all__ = [
 ]
 
 setup()
+# Registered here rather than in __main__, which `python -m` executes a second
+# time and would otherwise bump the run count twice.
+atexit.register(on_exit)
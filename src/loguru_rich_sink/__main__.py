@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import atexit
 import sys
+from typing import Optional
 
 from loguru import (
     logger,
@@ -26,32 +26,37 @@ from rich.progress import (
 from rich.traceback import install as tr_install
 
 from loguru_rich_sink.sink import FORMAT, LOGS_DIR, RichSink, increment, read, setup
+from loguru_rich_sink.sink import get_console as _get_console
 
 
-def get_console(console: Console = Console()) -> Console:
+def get_console(console: Optional[Console] = None) -> Console:
     """Initialize the console and return it.
 
     Args:
-        console (Console, optional): A Rich console. Defaults to Console().
+        console (Console, optional): A Rich console. Defaults to the shared \
+module-level console.
 
     Returns:
         Console: A Rich console.
     """
+    if console is None:
+        return _get_console()
     tr_install(console=console)
     return console
 
 
 def get_logger(
-    console: Console = get_console(), logger: Logger = logger
+    console: Optional[Console] = None, logger: Logger = logger
 ) -> Logger:  # type: ignore
     """Initialize the logger with two sinks and return it."""
+    console = get_console(console)
     logger = logger if logger is not None else logger
     run = setup()
     logger.remove()
     logger.configure(
         handlers=[
             {
-                "sink": RichSink(),
+                "sink": RichSink(console=console),
                 "format": "{message}",
                 "level": "INFO",
                 "backtrace": True,
@@ -62,6 +67,9 @@ def get_logger(
                 "sink": str(LOGS_DIR / "trace.log"),
                 "format": FORMAT,
                 "level": "TRACE",
+                # Batch writes into 64KB chunks instead of flushing every line;
+                # loguru closes (and flushes) the file when the handler is removed.
+                "buffering": 65536,
                 "backtrace": True,
                 "diagnose": True,
                 "colorize": False,
@@ -72,10 +80,9 @@ def get_logger(
     return logger
 
 
-def get_progress(console: Console = get_console()) -> Progress:
+def get_progress(console: Optional[Console] = None) -> Progress:
     """Initialize the progress bar and return it."""
-    if console is None:
-        console = Console()
+    console = get_console(console)
     progress = Progress(
         SpinnerColumn(spinner_name="earth"),
         TextColumn("[progress.description]{task.description}"),
@@ -84,6 +91,7 @@ def get_progress(console: Console = get_console()) -> Progress:
         TimeElapsedColumn(),
         TimeRemainingColumn(),
         MofNCompleteColumn(),
+        console=console,
     )
     progress.start()
     return progress
@@ -91,19 +99,11 @@ def get_progress(console: Console = get_console()) -> Progress:
 
 def on_exit():
     """At exit, read the run number and increment it."""
-    try:
-        run = read()
-        logger.info(f"Run {run} Completed")
-        run = increment()
-    except FileNotFoundError as fnfe:
-        logger.error(fnfe)
-        run = setup()
-        logger.info(f"Run {run} Completed")
-    run = increment()
+    run = read()
+    logger.info(f"Run {run} Completed")
+    increment()
 
 
-atexit.register(on_exit)
-
 if __name__ == "__main__":
     logger = get_logger()
 
@@ -118,4 +118,3 @@ if __name__ == "__main__":
 
     logger.info("Finished")
     sys.exit(0)
-    sys.exit(0)
@@ -1,43 +1,109 @@
 """The Rich Sink for the loguru logger."""
 
+import atexit
+import os
+import sys
+import traceback
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from queue import Empty, Full, Queue
+from threading import Thread
+from time import monotonic
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Union
+
+from rich.color import Color as RichColor
+from rich.color import blend_rgb
 from rich.console import Console
 from rich.panel import Panel
+from rich.segment import Segment, Segments
 
 from rich.style import Style
-from rich.text import Text
+from rich.text import Span, Text
 from rich.traceback import install as tr_install
 from rich_gradient import Color, Gradient
 
+_CONSOLE: Optional[Console] = None
+
+
 def get_console(
         record: bool = False,
         console: Optional[Console] = None) -> Console:
     """Initialize the console and return it.
 
     Args:
-        console (Console, optional): A Rich console. Defaults to Console().
+        record (bool, optional): Return a console that records its output. \
+Defaults to False.
+        console (Console, optional): A Rich console. Defaults to the shared \
+module-level console.
 
     Returns:
         Console: A Rich console.
     """
+    global _CONSOLE
     if console is None:
         if record:
             console = Console(record=True)
         else:
-            console = Console()
+            if _CONSOLE is None:
+                _CONSOLE = Console()
+                tr_install(console=_CONSOLE)
+            return _CONSOLE
     else:
         console.record=True if record else False
     tr_install(console=console)
     return console
 
 
+# Kept as a template string: loguru precompiles it once when the handler is
+# added, while a callable format would be called and re-memoized per record.
 FORMAT: str = (
     "{time:HH:mm:ss.SSS} | Run {extra[run]} | {file.name: ^12} | Line {line} | {level} | {message}"
 )
 CWD: Path = Path.cwd()
 LOGS_DIR: Path = CWD / "logs"
 RUN_FILE: Path = LOGS_DIR / "run.txt"
+_RUN: Optional[int] = None
+_LEVEL_NOS: Dict[str, int] = {
+    "TRACE": 5,
+    "DEBUG": 10,
+    "INFO": 20,
+    "SUCCESS": 25,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+
+def _level_no(level: Union[int, str, None], default: int = 0) -> int:
+    """Return the number of a level given by name or number, or `default` if invalid."""
+    if level is None:
+        return default
+    if isinstance(level, int):
+        return level
+    name = level.strip().upper()
+    if name in _LEVEL_NOS:
+        return _LEVEL_NOS[name]
+    try:
+        return int(name)
+    except ValueError:
+        return default
+
+
+# Records below this level number are skipped before any Rich object is built.
+# Loguru already filters by each handler's level, so nothing is skipped by default.
+_MIN_LEVEL_NO: int = _level_no(os.environ.get("LOGURU_RICH_SINK_LEVEL_NO"))
+
+
+@lru_cache(maxsize=None)
+def _find_project_root(start_dir: Path) -> Path:
+    """Walk up from `start_dir` to the first directory with a pyproject.toml."""
+    cwd: Path = start_dir
+    while not (cwd / "pyproject.toml").exists():
+        cwd = cwd.parent
+        if cwd == Path.home():
+            break
+    return cwd
 
 
 def find_cwd(
@@ -52,11 +118,7 @@ def find_cwd(
     Returns:
         Path: The current working directory.
     """
-    cwd: Path = start_dir
-    while not (cwd / "pyproject.toml").exists():
-        cwd = cwd.parent
-        if cwd == Path.home():
-            break
+    cwd: Path = _find_project_root(start_dir)
     if verbose:
         console = get_console()
         console.line(2)
@@ -79,7 +141,12 @@ def find_cwd(
 
 
 def setup() -> int:
-    """Setup the logger and return the run count."""
+    """Setup the logger and return the run count.
+
+    The run count is only read from the file the first time; afterwards it \
+is kept in memory and written back once at exit.
+    """
+    global _RUN
     console = get_console()
     if not LOGS_DIR.exists():
         LOGS_DIR.mkdir(parents=True)
@@ -89,33 +156,41 @@ def setup() -> int:
             f.write("0")
             console.print("Created Run File, Set to 0")
 
-    with open(RUN_FILE, "r", encoding="utf-8") as f:
-        run = int(f.read())
-        return run
+    if _RUN is None:
+        with open(RUN_FILE, "r", encoding="utf-8") as f:
+            _RUN = int(f.read())
+    return _RUN
 
 
 def read() -> int:
-    """Read the run count from the file."""
-    if not RUN_FILE.exists():
-        console.print("[b #ff0000]Run File Not Found[/][i #ff9900], Creating...[/]")
-        setup()
-    with open(RUN_FILE, "r", encoding="utf-8") as f:
-        run = int(f.read())
-    return run
+    """Return the run count, loading it from the file on first use."""
+    if _RUN is None:
+        return setup()
+    return _RUN
 
 
 def write(run: int) -> None:
     """Write the run count to the file."""
+    global _RUN
     with open(RUN_FILE, "w", encoding="utf-8") as f:
         f.write(str(run))
+    _RUN = run
 
 
 def increment() -> int:
-    """Increment the run count and write it to the file."""
-    run = read()
-    run += 1
-    write(run)
-    return run
+    """Increment the run count. It is written to the file at exit."""
+    global _RUN
+    _RUN = read() + 1
+    return _RUN
+
+
+def _persist_run() -> None:
+    """Write the in-memory run count to the file."""
+    if _RUN is not None:
+        write(_RUN)
+
+
+atexit.register(_persist_run)
 
 
 LEVEL_STYLES: Dict[str, Style] = {
@@ -138,101 +213,296 @@ GRADIENTS: Dict[str, List[Color]] = {
     "CRITICAL": [Color("#ff0000"), Color("#ff005f"), Color("#ff00af")],
 }
 
+# Per-level styles that never change, built once instead of on every emit.
+_BORDER_STYLES: Dict[str, Style] = {
+    level: style + Style(bold=True) for level, style in LEVEL_STYLES.items()
+}
+_REVERSE: Style = Style(reverse=True)
+_TITLE_SEP_STYLE: Style = Style.parse("italic #666666")
+_SUBTITLE_SEP_STYLE: Style = Style.parse("dim #aaaaaa")
+_RAMP_STEPS: int = 256
+
+
+def _interpolate(colors: List[Color], steps: int = _RAMP_STEPS) -> List[Style]:
+    """Return `steps` styles blending evenly across `colors`."""
+    triplets = [color.as_triplet() for color in colors]
+    segments = len(triplets) - 1
+    ramp: List[Style] = []
+    for step in range(steps):
+        position = step * segments / (steps - 1)
+        index = min(int(position), segments - 1)
+        triplet = blend_rgb(triplets[index], triplets[index + 1], position - index)
+        ramp.append(Style(color=RichColor.from_triplet(triplet)))
+    return ramp
+
+
+_GRADIENT_RAMP: Dict[str, List[Style]] = {
+    level: _interpolate(colors) for level, colors in GRADIENTS.items()
+}
+_TITLE_PREFIX: Dict[str, Text] = {
+    level: Gradient(f" {level} ", colors=colors).as_text()
+    for level, colors in GRADIENTS.items()
+}
+
+
+def _timestamp(time: datetime) -> str:
+    """Format the time as HH:MM:SS.mmm AM/PM with a single strftime call."""
+    ts = time.strftime("%H:%M:%S.%f %p")
+    return ts[:12] + ts[15:]
+
+
+def _title(level: str, file_name: str, line: int) -> Text:
+    """Return the panel title from the cached level prefix and the record location."""
+    title: Text = _TITLE_PREFIX[level].copy()
+    style = LEVEL_STYLES[level]
+    title.append("|", style=_TITLE_SEP_STYLE)
+    title.append(f" {file_name} ", style=style)
+    title.append("|", style=_TITLE_SEP_STYLE)
+    title.append(f" Line {line} ", style=style)
+    title.stylize(_REVERSE)
+    return title
+
+
+def _gradient(message: str, level: str) -> Text:
+    """Color the message by indexing into the level's precomputed gradient ramp."""
+    ramp = _GRADIENT_RAMP[level]
+    length = len(message)
+    text = Text(message, style="bold")
+    last = max(length - 1, 1)
+    text.spans = [
+        Span(index, index + 1, ramp[index * (_RAMP_STEPS - 1) // last])
+        for index in range(length)
+    ]
+    return text
+
+
+def _render(
+    run: int, level: str, message: str, time: datetime, line: int, file_name: str
+) -> Panel:
+    """Build the log panel for a single record."""
+    # title
+    title: Text = _title(level, file_name, line)
+
+    # subtitle
+    timestamp: str = _timestamp(time)
+    subtitle: Text = Text.assemble(
+        f"Run {run} | ",
+        timestamp[:2],
+        (":", _SUBTITLE_SEP_STYLE),
+        timestamp[3:5],
+        (":", _SUBTITLE_SEP_STYLE),
+        timestamp[6:],
+    )
+
+    # Message
+    message_text: Text = _gradient(message, level)
+    # Generate log panel with aligned title and subtitle
+    return Panel(
+        message_text,
+        title=title,
+        title_align="left",  # Left align the title
+        subtitle=subtitle,
+        subtitle_align="right",  # Right align the subtitle
+        border_style=_BORDER_STYLES[level],
+        padding=(1, 2),
+    )
+
+
+def _print_exported(console: Console, log_panel: Panel) -> str:
+    """Print the panel and return its plain text, rendering it only once."""
+    segments: List[Segment] = list(console.render(log_panel))
+    console.print(Segments(segments))
+    return "".join(segment.text for segment in segments if not segment.control)
+
+
+# Records waiting for the worker thread: (level, message, time, line, file name).
+# None is queued by `RichSink.stop()` to end the worker.
+_Item = Tuple[str, str, datetime, int, str]
+
+# Levels that are dropped rather than blocking the caller when the queue is full.
+_DROPPABLE_LEVELS: FrozenSet[str] = frozenset({"TRACE", "DEBUG", "INFO"})
+
+# Sinks with a running worker thread; `RichSink.stop()` removes them.
+_SINKS: "Set[RichSink]" = set()
+
+
+def _stop_sinks() -> None:
+    """Print queued records and stop every live RichSink before the interpreter exits."""
+    for sink in list(_SINKS):
+        sink.stop()
+
+
+atexit.register(_stop_sinks)
+
+
+def _report_error(items: List[_Item]) -> None:
+    """Write the current exception to stderr, the way loguru reports sink errors."""
+    if not sys.stderr:
+        return
+    try:
+        sys.stderr.write("--- Logging error in RichSink ---\n")
+        sys.stderr.write(f"Record was: {items!r}\n")
+        traceback.print_exc(file=sys.stderr)
+        sys.stderr.write("--- End of logging error ---\n")
+    except OSError:
+        pass
+
+
 class RichSink:
     """A loguru sink that uses the great `rich` library to print log messages.
 
+    By default records are queued by the caller and rendered in batches on a \
+background thread, so logging only costs a `queue.put` on the caller's thread. \
+The sink exposes `write()` so loguru calls `stop()` when its handler is removed.
+
     Args:
         run (Optional[int], optional): The current run number. If None, it will \
 be read from a file. Defaults to None.
         console (Optional[Console]): A Rich console. If None, it will be \
 initialized. Defaults to None.
+        maxsize (int, optional): The maximum number of queued records. When \
+full, TRACE, DEBUG and INFO records are dropped and higher levels block. \
+Defaults to 10000.
+        batch_size (int, optional): The maximum number of records printed \
+per batch. Defaults to 64.
+        export (bool, optional): Render each record on the caller's thread \
+and store the rendered text in `record["extra"]["rich"]`; no worker thread \
+is started. Defaults to False.
+        background (bool, optional): Print from a background worker thread. \
+If False, each record is printed on the caller's thread. Defaults to True.
+        min_level (Union[int, str, None], optional): Skip records below this \
+level name or number. Defaults to None, using LOGURU_RICH_SINK_LEVEL_NO or 0.
 
 
     """
-    def __init__(self, run: Optional[int] = None, console: Optional[Console] = None) -> None:
+    def __init__(
+        self,
+        run: Optional[int] = None,
+        console: Optional[Console] = None,
+        maxsize: int = 10000,
+        batch_size: int = 64,
+        export: bool = False,
+        min_level: Union[int, str, None] = None,
+        background: bool = True,
+    ) -> None:
         if run is None:
-            try:
-                run = read()
-            except FileNotFoundError:
-                run = setup()
+            run = read()
         self.run = run
         self.console = console or get_console()
+        self.batch_size = batch_size
+        self.export = export
+        self.min_level_no = _level_no(min_level, _MIN_LEVEL_NO)
+        self._queue: "Queue[Optional[_Item]]" = Queue(maxsize=maxsize)
+        self._worker: Optional[Thread] = None
+        if background and not export:
+            self._worker = Thread(target=self._drain, name="RichSink", daemon=True)
+            self._worker.start()
+            _SINKS.add(self)
 
     def __call__(self, message) -> None:
         record = message.record
-        level = record["level"].name
-        colors = GRADIENTS[level]
-        style = LEVEL_STYLES[level]
-
-        # title
-        title: Text = Gradient(
-            f" {level} | {record['file'].name} | Line {record['line']} ", colors=colors
-        ).as_text()
-        title.highlight_words("|", style="italic #666666")
-        title.stylize(Style(reverse=True))
-
-        # subtitle
-        subtitle: Text = Text.assemble(
-            Text(f"Run {self.run}"),
-            Text(" | "),
-            Text(record["time"].strftime("%H:%M:%S.%f")[:-3]),
-            Text(record["time"].strftime(" %p")),
+        level_obj = record["level"]
+        if level_obj.no < self.min_level_no:
+            return
+        item: _Item = (
+            level_obj.name,
+            record["message"],
+            record["time"],
+            record["line"],
+            record["file"].name,
         )
-        subtitle.highlight_words(":", style="dim #aaaaaa")
-
-        # Message
-        message_text: Text = Gradient(record["message"], colors, style="bold")
-        # Generate and print log panel with aligned title and subtitle
-        log_panel: Panel = Panel(
-            message_text,
-            title=title,
-            title_align="left",  # Left align the title
-            subtitle=subtitle,
-            subtitle_align="right",  # Right align the subtitle
-            border_style=style + Style(bold=True),
-            padding=(1, 2),
-        )
-        self.console.print(log_panel)
+        if self.export:
+            record["extra"]["rich"] = _print_exported(
+                self.console, _render(self.run, *item)
+            )
+            return
+        if self._worker is None or not self._worker.is_alive():
+            # No worker, or it was stopped: print on the caller's thread.
+            self.console.print(_render(self.run, *item))
+            return
+        try:
+            self._queue.put_nowait(item)
+        except Full:
+            if item[0] in _DROPPABLE_LEVELS:
+                return
+            self._queue.put(item)
+
+    def write(self, message) -> None:
+        """Log a message; lets loguru treat the sink as a stoppable stream."""
+        self(message)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Block until every queued record has been printed.
+
+        Args:
+            timeout (Optional[float], optional): The most seconds to wait. \
+Defaults to None, waiting as long as the worker thread is alive.
+        """
+        worker = self._worker
+        if worker is None:
+            return
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks and worker.is_alive():
+                wait = 0.1
+                if deadline is not None:
+                    wait = min(wait, deadline - monotonic())
+                    if wait <= 0:
+                        return
+                self._queue.all_tasks_done.wait(wait)
+
+    def stop(self) -> None:
+        """Print every queued record, then end the worker thread."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        _SINKS.discard(self)
+
+    def _drain(self) -> None:
+        """Print queued records in batches until `stop()` is called."""
+        while True:
+            items: List[Optional[_Item]] = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            stopping = False
+            try:
+                panels: List[Panel] = []
+                for item in items:
+                    if item is None:
+                        stopping = True
+                        continue
+                    try:
+                        panels.append(_render(self.run, *item))
+                    except Exception:
+                        _report_error([item])
+                if panels:
+                    try:
+                        self.console.print(*panels)
+                    except Exception:
+                        _report_error([item for item in items if item is not None])
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+
+_RICH_SINK: Optional[RichSink] = None
 
-def rich_sink(message) -> None:
-    """A loguru sink that uses the great `rich` library to print log messages."""
-    record = message.record
-    level = record["level"].name
-    colors = GRADIENTS[level]
-    style = LEVEL_STYLES[level]
 
-    # title
-    title: Text = Gradient(
-        f" {level} | {record['file'].name} | Line {record['line']} ", colors=colors
-    ).as_text()
-    title.highlight_words("|", style="italic #999999")
-    title.stylize(Style(reverse=True))
-
-    # subtitle
-    run: int = read()
-    subtitle: Text = Text.assemble(
-        Text(f"Run {run}"),
-        Text(" | "),
-        Text(record["time"].strftime("%H:%M:%S.%f")[:-3]),
-        Text(record["time"].strftime(" %p")),
-    )
-    subtitle.highlight_words(":", style="dim #aaaaaa")
+def rich_sink(message) -> None:
+    """A loguru sink that uses the great `rich` library to print log messages.
 
-    # Message
-    message_text: Text = Gradient(record["message"], colors, style="bold")
-    # Generate and print log panel with aligned title and subtitle
-    log_panel: Panel = Panel(
-        message_text,
-        title=title,
-        title_align="left",  # Left align the title
-        subtitle=subtitle,
-        subtitle_align="right",  # Right align the subtitle
-        border_style=style + Style(bold=True),
-        padding=(1, 2),
-    )
-    console = get_console(True)
-    console.print(log_panel)
-    record["extra"]["rich"] = console.export_text()
+    Delegates to a shared `RichSink` that prints on the caller's thread, since \
+loguru never stops a plain function sink and so cannot flush a queue.
+    """
+    global _RICH_SINK
+    if _RICH_SINK is None:
+        _RICH_SINK = RichSink(background=False)
+    _RICH_SINK(message)
 
 
 if __name__ == "__main__":